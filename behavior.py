@@ -1,6 +1,8 @@
 import random
 from pet_frames import PET_FRAMES
 from state import set_mode
+from timers import on_timer, set_timer, timer_active
+from toys import SLAP_RANGE, get_toybox, nearest_toy, push_toy, toys_moving, update_toys
 from utils import DEFAULT_PEN_HEIGHT, DEFAULT_PEN_WIDTH, save_state
 
 def say_hello(state):
@@ -18,7 +20,11 @@ def speak(state, text, duration = 3):
     }
     text = random.choice(variations.get(text, [text]))
     state["speech"] = text
-    state["message_timer"] = duration
+    set_timer(state, "speech", duration)
+
+@on_timer("speech")
+def clear_speech(state):
+    state["speech"] = ""
 
 def update_behavior(state):
     """Handle switching between resting, wandering, and sleeping."""
@@ -49,26 +55,33 @@ def update_behavior(state):
         speak(state, "Zzz...")
         return
 
-    # --- Normal autonomous behavior cycle ---
-    if state.get("behavior_timer", 0) > 0:
-        state["behavior_timer"] -= 1
-    else:
-        next_behavior = random.choices(
-            ["resting", "wandering"],
-            weights=[1 - (energy / 10), energy / 10],
-            k=1
-        )[0]
-        set_mode(state, next_behavior)
-
-        low = max(5, int(15 - energy))
-        high = max(10, int(20 - energy))
-        state["behavior_timer"] = random.randint(low, high)
-
-        if next_behavior != "wandering":
-            state["target_x"] = None
-            state["target_y"] = None
-
-    # --- Clamp inside pen ---
+    clamp_to_pen(state)
+
+@on_timer("behavior")
+def pick_next_behavior(state):
+    """Normal autonomous behavior cycle: choose what to do next, and for how long."""
+    energy = state.get("energy", 0)
+    if state.get("behavior") == "playing" and state.get("ball_state") != "gone":
+        # Play ends on its own in update_ball; check back later
+        set_timer(state, "behavior", max(5, int(15 - energy)))
+        return
+    next_behavior = random.choices(
+        ["resting", "wandering"],
+        weights=[1 - (energy / 10), energy / 10],
+        k=1
+    )[0]
+    set_mode(state, next_behavior)
+
+    low = max(5, int(15 - energy))
+    high = max(10, int(20 - energy))
+    set_timer(state, "behavior", random.randint(low, high))
+
+    if next_behavior != "wandering":
+        state["target_x"] = None
+        state["target_y"] = None
+
+def clamp_to_pen(state):
+    """Keep the pet inside the pen."""
     state["pos_x"] = max(1, min(DEFAULT_PEN_WIDTH - 8, state["pos_x"]))
     state["pos_y"] = max(1, min(DEFAULT_PEN_HEIGHT - 2, state["pos_y"]))
 
@@ -104,13 +117,15 @@ def update_wandering(state, pen_width, pen_height):
     # Reached target? Rest for a while
     if abs(state["pos_x"] - state["target_x"]) <= 1 and abs(state["pos_y"] - state["target_y"]) <= 1:
         set_mode(state, "resting")
-        state["behavior_timer"] = random.randint(8, 20)
+        set_timer(state, "behavior", random.randint(8, 20))
         state["target_x"] = None
         state["target_y"] = None
 
 
-def update_ball(state, pen_width):
-    """Simplified play logic: approach ball, slap it away, then rest."""
+def update_ball(state, pen_width, pen_height=DEFAULT_PEN_HEIGHT):
+    """Play logic: move the toys, approach the nearest one, slap it, rest when it settles."""
+    update_toys(state, pen_width, pen_height)
+
     if state["ball_state"] == "gone":
         return
 
@@ -121,42 +136,52 @@ def update_ball(state, pen_width):
         speak(state, "sleepy")
         return
 
+    target = nearest_toy(state, state["pos_x"], state["pos_y"], pen_width, pen_height)
+    if target is None:
+        state["ball_state"] = "gone"
+        set_mode(state, "resting")
+        return
+    box = get_toybox(state)
+    toy_x, toy_y = box["x"][target], box["y"][target]
+
     # Wait briefly before approaching
-    if state.get("play_delay_timer", 0) > 0:
-        state["play_delay_timer"] -= 1
-        if state["ball_x"] is not None:
-            state["direction"] = "right" if state["ball_x"] > state["pos_x"] else "left"
+    if timer_active(state, "play_delay"):
+        state["direction"] = "right" if toy_x > state["pos_x"] else "left"
         return
 
-    # --- Approach the ball (horizontal only) ---
+    # --- Approach the toy ---
     if state["behavior"] == "playing" and state["ball_state"] == "resting":
-        dx = state["ball_x"] - state["pos_x"]
+        dx = toy_x - state["pos_x"]
+        dy = toy_y - state["pos_y"]
 
-        # Move horizontally toward the ball
         if abs(dx) > 1:
-            step = 2 if abs(dx) > 4 else 1
-            state["pos_x"] += step if dx > 0 else -step
+            state["pos_x"] += 1 if dx > 0 else -1
             state["direction"] = "right" if dx > 0 else "left"
+        if abs(dy) >= 1:
+            state["pos_y"] += 1 if dy > 0 else -1
+        clamp_to_pen(state)
 
         # Slap when close enough
-        if abs(dx) <= 4:
+        if abs(dx) <= SLAP_RANGE and abs(dy) < 2:
             state["action_mode"] = "slap"
             state["ball_state"] = "flying"
-            state["ball_dir"] = 1 if state["direction"] == "right" else -1
+            push_toy(
+                state, target,
+                (3 if state["direction"] == "right" else -3) + random.uniform(-0.5, 0.5),
+                random.uniform(-1, 1),
+            )
             state["message"] = f'🎾 {state["name"]} bats the ball!'
             speak(state, "Mow!" if state["species"] == "cat" else "Ree!")
             return
 
-    # --- Ball flying away ---
-    if state["ball_state"] == "flying":
-        state["ball_x"] += state["ball_dir"] * 2
-        if state["ball_x"] <= 0 or state["ball_x"] >= pen_width:
-            state["ball_state"] = "gone"
-            set_mode(state, "resting")
-            state["target_x"] = None
-            state["target_y"] = None
-            state["message"] = f'😸 {state["name"]} looks pleased!'
-            speak(state, "Miauw!" if state["species"] == "cat" else "Oink!")
+    # --- Toys bouncing around ---
+    if state["ball_state"] == "flying" and toys_moving(state) == 0:
+        state["ball_state"] = "gone"
+        set_mode(state, "resting")
+        state["target_x"] = None
+        state["target_y"] = None
+        state["message"] = f'😸 {state["name"]} looks pleased!'
+        speak(state, "Miauw!" if state["species"] == "cat" else "Oink!")
 
 def act(state, action):
     behavior = state.get("behavior", "resting")
@@ -185,11 +210,4 @@ def act(state, action):
         speak(state, f"What is {action}?")
         return False
     save_state(state)
-
-def update_speech(state):
-    """Reduce message timer and clear speech when expired."""
-    if state.get("message_timer", 0) > 0:
-        state["message_timer"] -= 1
-        if state["message_timer"] <= 0:
-            state["speech"] = ""
-
+    return True
@@ -2,6 +2,8 @@ import curses
 import random
 from behavior import act, speak
 from state import set_mode
+from timers import set_timer
+from toys import add_toy, toy_bounds, toy_count
 from utils import prompt_for_name, AVAILABLE_SPECIES, DEFAULT_PEN_WIDTH, DEFAULT_PEN_HEIGHT, save_state, toggle_debug_mode
 
 def handle_input(stdscr, key, state):
@@ -28,14 +30,20 @@ def handle_input(stdscr, key, state):
             speak(state, "Busy...")
             return True
 
-        act(state, "play")
-        spawn_ball_opposite_side(state, DEFAULT_PEN_WIDTH)
+        if act(state, "play"):
+            spawn_ball_opposite_side(state, DEFAULT_PEN_WIDTH)
 
     elif key in (ord("t"), ord("T")):
         act(state, "pet")
 
     elif key in (ord("s"), ord("S")):
         switch_species(state)
+
+    elif key in (ord("y"), ord("Y")):
+        toss_toy(state, "yarn", DEFAULT_PEN_WIDTH, DEFAULT_PEN_HEIGHT)
+
+    elif key in (ord("o"), ord("O")):
+        toss_toy(state, "treat", DEFAULT_PEN_WIDTH, DEFAULT_PEN_HEIGHT)
     
     elif key == curses.KEY_MOUSE:
         try:
@@ -47,7 +55,12 @@ def handle_input(stdscr, key, state):
     return True
 
 def spawn_ball_opposite_side(state, pen_width, margin=3):
-    """Spawn the ball on the opposite side of the animal, within pen bounds."""
+    """Spawn a ball on the opposite side of the animal, unless there is already a toy to play with."""
+    state["ball_state"] = "resting"
+    set_timer(state, "play_delay", random.randint(3, 6))
+    if toy_count(state) > 0:
+        return
+
     cat_x = state["pos_x"]
     safe_left = margin + 3
     safe_right = pen_width - (margin + 3)
@@ -63,10 +76,18 @@ def spawn_ball_opposite_side(state, pen_width, margin=3):
         state["direction"] = "right"
 
     # Same row as the animal
-    state["ball_x"] = ball_x
-    state["ball_y"] = state["pos_y"]
-    state["ball_state"] = "resting"
-    state["play_delay_timer"] = random.randint(3, 6)
+    add_toy(state, "ball", ball_x, state["pos_y"])
+
+def toss_toy(state, kind, pen_width, pen_height):
+    """Throw a toy into the pen from a random spot."""
+    left, right, top, bottom = toy_bounds(pen_width, pen_height)
+    added = add_toy(
+        state, kind,
+        random.randint(left + 1, right - 1), random.randint(top + 1, bottom - 1),
+        random.uniform(-2, 2), random.uniform(-1, 1),
+    )
+    if added is None:
+        speak(state, "Too many toys!")
 
 def handle_mouse_click(mx, my, state):    
     """Handle mouse click — move pet if inside pen."""
@@ -88,12 +109,13 @@ def handle_mouse_click(mx, my, state):
         if state.get("behavior") == "sleeping":
             speak(state, "sleepy")
             return
-        state["target_x"] = mx
-        state["target_y"] = my - pen_top  # adjust for pen offset
+        # Keep the target where the pet can actually stand
+        state["target_x"] = max(1, min(DEFAULT_PEN_WIDTH - 8, mx))
+        state["target_y"] = max(1, min(DEFAULT_PEN_HEIGHT - 2, my - pen_top))  # adjust for pen offset
         set_mode(state, "wandering")
-        state["behavior_timer"] = 10  # let it walk for a bit
+        set_timer(state, "behavior", 10)  # let it walk for a bit
         speak(state, "..")
-        state["render_click_timer"] = 2
+        set_timer(state, "click_marker", 2)
         return
 
 def switch_species(state):
@@ -111,5 +133,5 @@ def switch_species(state):
     else:
         speak(state, f"✨ Turned into a {next_species}!")
 
-    state["message_timer"] = 5
+    set_timer(state, "speech", 5)
     save_state(state)
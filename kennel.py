@@ -0,0 +1,147 @@
+"""Kennel: many saved pets in one directory.
+
+    petbot_kennel/
+        index.jsonl      one {"id", "name", "species", "last_seen"} record per line
+        pets/<id>.json   full state of one pet
+
+The index is all a pet picker needs, so listing never opens a pet file.
+A pet's own file is only read when it is opened, and offline catch-up
+(``update_emotions``) is applied at that point.
+
+The index is an append-only log: adding, closing or removing a pet
+appends one line, and the last line for an id wins. Saving a pet while
+it is being played with only rewrites its own file. Reading never writes;
+when a pet is closed or removed and the log has grown well past the
+number of pets, it is compacted then.
+
+A single-pet save (``petbot_state.json``) is imported the first time the
+kennel is opened empty. The ``.imported`` marker keeps it from being
+imported again once its pet has been removed.
+"""
+import json, os, uuid
+from datetime import datetime
+from pathlib import Path
+import metrics
+from state import load_state, update_emotions
+from utils import STATE_FILE, state_to_json
+
+KENNEL_DIR = Path.cwd() / "petbot_kennel"
+INDEX_FIELDS = ("name", "species", "last_seen")
+COMPACT_SLACK = 64
+
+def _index_path(kennel_dir):
+    return kennel_dir / "index.jsonl"
+
+def _pet_path(kennel_dir, pet_id):
+    return kennel_dir / "pets" / f"{pet_id}.json"
+
+def _write_atomic(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+def _append_index(record, kennel_dir):
+    kennel_dir.mkdir(parents=True, exist_ok=True)
+    with open(_index_path(kennel_dir), "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+def _index_record(state):
+    record = {field: state.get(field) for field in INDEX_FIELDS}
+    record["id"] = state["kennel_id"]
+    return record
+
+def _imported_path(kennel_dir):
+    return kennel_dir / ".imported"
+
+def _read_index(kennel_dir):
+    """Return the live index entries and the number of lines in the log."""
+    try:
+        lines = _index_path(kennel_dir).read_text().splitlines()
+    except OSError:
+        return {}, 0
+
+    pets = {}
+    for line in lines:
+        try:
+            record = json.loads(line)
+            pet_id = record.pop("id")
+        except (ValueError, KeyError, AttributeError, TypeError):
+            continue  # torn or hand-edited line
+        if record.get("removed"):
+            pets.pop(pet_id, None)
+        else:
+            pets[pet_id] = record
+    return pets, len(lines)
+
+def load_index(kennel_dir=KENNEL_DIR):
+    """Return {pet_id: {"name", "species", "last_seen"}} without touching pet files."""
+    return _read_index(kennel_dir)[0]
+
+def compact_index(kennel_dir=KENNEL_DIR):
+    """Rewrite the index with one line per pet if the log has grown well past that."""
+    pets, line_count = _read_index(kennel_dir)
+    if line_count > 2 * len(pets) + COMPACT_SLACK:
+        _write_atomic(
+            _index_path(kennel_dir),
+            "".join(json.dumps(dict(entry, id=pet_id)) + "\n" for pet_id, entry in pets.items()),
+        )
+
+def list_pets(kennel_dir=KENNEL_DIR):
+    """Return index entries (with "id") sorted by most recently seen."""
+    pets = [dict(entry, id=pet_id) for pet_id, entry in load_index(kennel_dir).items()]
+    pets.sort(key=lambda p: p.get("last_seen") or "", reverse=True)
+    return pets
+
+def save_pet(state, kennel_dir=KENNEL_DIR):
+    """Write a kennel pet's state file. The index is updated by close_pet."""
+    data = state_to_json(state)
+    _write_atomic(_pet_path(kennel_dir, state["kennel_id"]), data)
+    metrics.inc("save_bytes", len(data.encode("utf-8")))
+
+def close_pet(state, kennel_dir=KENNEL_DIR):
+    """Record the pet's name, species and last_seen in the index when it is put away."""
+    _append_index(_index_record(state), kennel_dir)
+    compact_index(kennel_dir)
+
+def load_pet(pet_id, kennel_dir=KENNEL_DIR):
+    """Open one pet, applying catch-up for the time it spent in the kennel."""
+    path = _pet_path(kennel_dir, pet_id)
+    if not path.exists():
+        raise KeyError(f"No pet {pet_id!r} in {kennel_dir}")
+    state = load_state(path)
+    state["kennel_id"] = pet_id
+    update_emotions(state)
+    return state
+
+def add_pet(name=None, species=None, kennel_dir=KENNEL_DIR, state=None):
+    """Put a new pet (or an existing state) into the kennel and return its state."""
+    state = load_state(None) if state is None else state
+    if name:
+        state["name"] = name
+    if species:
+        state["species"] = species
+    state["kennel_id"] = uuid.uuid4().hex[:12]
+    state.setdefault("last_seen", datetime.now().isoformat())
+    save_pet(state, kennel_dir)
+    _append_index(_index_record(state), kennel_dir)
+    return state
+
+def remove_pet(pet_id, kennel_dir=KENNEL_DIR):
+    _append_index({"id": pet_id, "removed": True}, kennel_dir)
+    try:
+        _pet_path(kennel_dir, pet_id).unlink()
+    except FileNotFoundError:
+        pass
+    compact_index(kennel_dir)
+
+def import_state_file(path=STATE_FILE, kennel_dir=KENNEL_DIR):
+    """Copy a single-pet save into the kennel once. Returns the new pet id, or None."""
+    marker = _imported_path(kennel_dir)
+    if marker.exists() or not path.exists():
+        return None
+    state = load_state(path)
+    state.pop("kennel_id", None)
+    pet_id = add_pet(kennel_dir=kennel_dir, state=state)["kennel_id"]
+    marker.write_text(f"{path}\n")
+    return pet_id
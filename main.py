@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import curses, time
-from state import load_state, update_emotions
-from behavior import update_behavior, update_wandering, update_ball, update_speech, say_hello
-from render import draw_frame, update_animation
+import argparse, curses, time
+import metrics
+from kennel import add_pet, close_pet, import_state_file, list_pets, load_pet, remove_pet
+from state import load_state, start_session, update_emotions
+from behavior import update_behavior, update_wandering, update_ball, say_hello
+from render import draw_frame, draw_pet_picker, update_animation
 from game_actions import handle_input
-from utils import DEFAULT_PEN_HEIGHT, DEFAULT_PEN_WIDTH, init_colors, save_state
+from timers import advance_timers
+from status import open_status, publish_status, close_status
+from utils import DEFAULT_PEN_HEIGHT, DEFAULT_PEN_WIDTH, init_colors, prompt_for_name, save_state
 
 FPS = 1.5
 
@@ -17,44 +21,177 @@ speed_map = {
     "resting": 1 / FPS
 }
 
-def main(stdscr):
+# Keys for live fast-forward: simulated seconds per real second (0 pauses)
+SIM_SPEEDS = {ord("1"): 1, ord("2"): 10, ord("3"): 100, ord(" "): 0}
+MAX_FPS = 30
+MAX_TICKS_PER_FRAME = 1000
+
+def tick_interval(state):
+    """Seconds of simulated time between ticks in the current behavior."""
+    return speed_map.get(state["behavior"], 1 / FPS)
+
+def tick(state):
+    """Advance the simulation by one step (everything except drawing and input)."""
+    advance_timers(state)
+    update_behavior(state)
+    update_wandering(state, DEFAULT_PEN_WIDTH, DEFAULT_PEN_HEIGHT)
+    update_ball(state, DEFAULT_PEN_WIDTH, DEFAULT_PEN_HEIGHT)
+    update_animation(state)
+
+def choose_pet(stdscr):
+    """Let the player pick a pet from the kennel. Returns its state, or None to quit."""
+    pets = list_pets()
+    if not pets and import_state_file():
+        pets = list_pets()
+
+    stdscr.nodelay(False)
+    selected = 0
+    error = None
+    try:
+        while True:
+            draw_pet_picker(stdscr, pets, selected, error)
+            error = None
+            key = stdscr.getch()
+            if key in (ord("q"), ord("Q")):
+                return None
+            elif key == curses.KEY_UP:
+                selected = max(0, selected - 1)
+            elif key == curses.KEY_DOWN:
+                selected = max(0, min(len(pets) - 1, selected + 1))
+            elif key == curses.KEY_PPAGE:
+                selected = max(0, selected - 10)
+            elif key == curses.KEY_NPAGE:
+                selected = max(0, min(len(pets) - 1, selected + 10))
+            elif key in (ord("n"), ord("N")):
+                name = prompt_for_name(stdscr, {}, "Name your new pet: ")
+                if name:
+                    return add_pet(name)
+                stdscr.nodelay(False)
+            elif key in (curses.KEY_ENTER, 10, 13) and pets:
+                pet = pets[selected]
+                try:
+                    return load_pet(pet["id"])
+                except KeyError:
+                    # Listed in the index but its save is gone
+                    remove_pet(pet["id"])
+                    del pets[selected]
+                    selected = max(0, min(selected, len(pets) - 1))
+                    error = f'No save found for {pet.get("name", "that pet")}; removed it from the kennel.'
+    finally:
+        stdscr.nodelay(True)
+
+def main(stdscr, kennel=False):
     curses.curs_set(0)
     curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
     curses.mouseinterval(0)
     init_colors()
     stdscr.nodelay(True)
-    state = load_state()
-    state["frame_index"] = 0 # reset always
-    state["ball_state"] = "gone" # reset always
-    update_emotions(state)
+    if kennel:
+        state = choose_pet(stdscr)  # catch-up is applied when the pet is opened
+        if state is None:
+            return
+    else:
+        state = load_state()
+        update_emotions(state)
+    start_session(state)
     
     say_hello(state)
+    status = open_status()
+
+    speed = 1
+    sim_time = 0.0       # seconds of simulated time elapsed
+    last_tick = None     # sim_time of the last tick
+    last_real = time.monotonic()
+    last_draw = 0.0
+    dirty = True
+    rate_start, rate_ticks, sim_rate = last_real, 0, 0.0
 
     try:
         while True:
-            stdscr.clear()
-            update_behavior(state)
-            update_wandering(state, DEFAULT_PEN_WIDTH, DEFAULT_PEN_HEIGHT)
-            update_ball(state, DEFAULT_PEN_WIDTH)
-            update_speech(state)
-            update_animation(state)
-            draw_frame(stdscr, state)
-
-            # --- Input handling ---
-            key = stdscr.getch()
-            if key != -1:
-                keep_running = handle_input(stdscr, key, state)
-                if not keep_running:
+            now = time.monotonic()
+            sim_time += (now - last_real) * speed
+            last_real = now
+
+            # --- Simulation: as many ticks as sim time allows ---
+            ticks_run = 0
+            while ticks_run < MAX_TICKS_PER_FRAME:
+                interval = tick_interval(state)
+                if last_tick is not None and sim_time - last_tick < interval:
                     break
+                with metrics.timed("tick"):
+                    tick(state)
+                metrics.inc("ticks")
+                last_tick = sim_time if last_tick is None else last_tick + interval
+                ticks_run += 1
+            else:
+                sim_time = last_tick  # too far behind: drop the backlog, keep input responsive
+
+            if ticks_run:
+                dirty = True
+                rate_ticks += ticks_run
+                metrics.record_pet(state)
+
+            if now - rate_start >= 1:
+                sim_rate = rate_ticks / (now - rate_start)
+                rate_start, rate_ticks = now, 0
+                dirty = True
+
+            # --- Rendering: skip frames beyond what the terminal can show ---
+            if dirty and now - last_draw >= 1 / MAX_FPS:
+                stdscr.erase()
+                with metrics.timed("status"):
+                    publish_status(status, state)
+                with metrics.timed("render"):
+                    draw_frame(stdscr, state, (speed, sim_rate))
+                metrics.inc("frames_rendered")
+                last_draw, dirty = now, False
 
-            # --- Timing ---
-            time.sleep(speed_map.get(state["behavior"], 1 / FPS))
+            # --- Input handling: wait for a key until the next tick or frame is due ---
+            wait = 0.1
+            if speed:
+                wait = min(wait, (last_tick + tick_interval(state) - sim_time) / speed)
+            if dirty:
+                wait = min(wait, last_draw + 1 / MAX_FPS - now)
+            stdscr.timeout(max(0, int(wait * 1000)))
 
-            if state.get("render_click_timer", 0) > 0:
-               state["render_click_timer"] = max(0, state.get("render_click_timer", 0) - 1)
+            key = stdscr.getch()
+            if key == -1:
+                continue
+            metrics.inc("input_events")
+            dirty = True
+            if key in SIM_SPEEDS:
+                # Time waited so far ran at the old speed
+                now = time.monotonic()
+                sim_time += (now - last_real) * speed
+                last_real = now
+                speed = SIM_SPEEDS[key]
+                continue
+            handling_started = time.monotonic()
+            with metrics.timed("input"):
+                keep_running = handle_input(stdscr, key, state)
+            # Time spent in input handling (e.g. typing a name) is not sim time
+            last_real += time.monotonic() - handling_started
+            metrics.record_pet(state)
+            if not keep_running:
+                break
 
     finally:
         save_state(state)
+        if state.get("kennel_id"):
+            close_pet(state)
+        close_status(status)
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="A tiny terminal pet.")
+    parser.add_argument("--kennel", action="store_true", help="pick from many saved pets")
+    parser.add_argument("--metrics-file", help="Prometheus textfile-collector file to keep updated")
+    parser.add_argument("--metrics-interval", type=float, default=15, help="seconds between metrics file writes")
+    parser.add_argument("--metrics-port", type=int, help="serve metrics on http://127.0.0.1:PORT/metrics")
+    args = parser.parse_args()
+
+    if args.metrics_file or args.metrics_port:
+        metrics.start_exporter(args.metrics_file, args.metrics_interval, args.metrics_port)
+    try:
+        curses.wrapper(main, args.kennel)
+    finally:
+        metrics.stop_exporter()
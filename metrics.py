@@ -0,0 +1,178 @@
+"""In-process metrics with Prometheus text export.
+
+The game loop only bumps numbers in memory. A background thread writes
+them atomically to a textfile-collector file every few seconds, and an
+optional HTTP endpoint on localhost serves the same text on request.
+Nothing here touches the disk or network unless ``start_exporter`` is called.
+"""
+import os, threading, time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+COUNTERS = {
+    "ticks": "Simulation ticks executed.",
+    "frames_rendered": "Frames drawn to the terminal.",
+    "input_events": "Key and mouse events handled.",
+    "saves": "save_state calls.",
+    "save_bytes": "Bytes written by save_state.",
+}
+PET_GAUGES = ("hunger", "happiness", "energy")
+BEHAVIORS = ("resting", "wandering", "sleeping", "eating", "playing", "petting")
+
+_lock = threading.Lock()
+_counters = dict.fromkeys(COUNTERS, 0)
+_gauges = dict.fromkeys(PET_GAUGES, 0.0)
+_behavior = ""
+_stages = {}  # stage -> [count, total seconds, max seconds]
+
+_exporter = None
+
+def inc(name, amount=1):
+    with _lock:
+        _counters[name] += amount
+
+def observe(stage, seconds):
+    """Record how long one run of a loop stage took."""
+    with _lock:
+        summary = _stages.get(stage)
+        if summary is None:
+            _stages[stage] = [1, seconds, seconds]
+        else:
+            summary[0] += 1
+            summary[1] += seconds
+            if seconds > summary[2]:
+                summary[2] = seconds
+
+@contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+def record_pet(state):
+    """Copy the pet's current stats into the gauges."""
+    global _behavior
+    with _lock:
+        for name in PET_GAUGES:
+            _gauges[name] = float(state.get(name, 0))
+        _behavior = state.get("behavior", "")
+
+def render_metrics():
+    """Return all metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        behavior = _behavior
+        stages = {stage: list(summary) for stage, summary in _stages.items()}
+
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines += [
+            f"# HELP petbot_{name}_total {help_text}",
+            f"# TYPE petbot_{name}_total counter",
+            f"petbot_{name}_total {counters[name]}",
+        ]
+
+    lines += [
+        "# HELP petbot_stage_seconds Time spent in each main loop stage.",
+        "# TYPE petbot_stage_seconds summary",
+    ]
+    for stage, (count, total, _) in sorted(stages.items()):
+        lines += [
+            f'petbot_stage_seconds_count{{stage="{stage}"}} {count}',
+            f'petbot_stage_seconds_sum{{stage="{stage}"}} {total:.9f}',
+        ]
+    lines += [
+        "# HELP petbot_stage_seconds_max Slowest run of each main loop stage.",
+        "# TYPE petbot_stage_seconds_max gauge",
+    ]
+    for stage, (_, _, slowest) in sorted(stages.items()):
+        lines.append(f'petbot_stage_seconds_max{{stage="{stage}"}} {slowest:.9f}')
+
+    for name in PET_GAUGES:
+        lines += [
+            f"# HELP petbot_pet_{name} Current pet {name} (0-10).",
+            f"# TYPE petbot_pet_{name} gauge",
+            f"petbot_pet_{name} {gauges[name]:g}",
+        ]
+    lines += [
+        "# HELP petbot_pet_behavior Current pet behavior (1 for the active one).",
+        "# TYPE petbot_pet_behavior gauge",
+    ]
+    for name in BEHAVIORS:
+        lines.append(f'petbot_pet_behavior{{behavior="{name}"}} {int(name == behavior)}')
+
+    return "\n".join(lines) + "\n"
+
+def write_textfile(path):
+    """Atomically replace path with the current metrics."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(render_metrics())
+    os.replace(tmp, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # don't scribble over the curses screen
+
+class _Exporter:
+    def __init__(self, path, interval, port):
+        self.path = path
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.threads = []
+        self.server = None
+
+        if path is not None:
+            self.threads.append(threading.Thread(target=self._write_loop, daemon=True))
+        if port is not None:
+            self.server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            self.server.daemon_threads = True
+            self.threads.append(threading.Thread(target=self.server.serve_forever, daemon=True))
+        for thread in self.threads:
+            thread.start()
+
+    def _write_loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                write_textfile(self.path)
+            except OSError:
+                pass
+
+    def stop(self):
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.path is not None:
+            try:
+                write_textfile(self.path)
+            except OSError:
+                pass
+
+def start_exporter(path=None, interval=15, port=None):
+    """Start writing metrics to path every interval seconds and/or serving them on port."""
+    global _exporter
+    stop_exporter()
+    _exporter = _Exporter(path, interval, port)
+
+def stop_exporter():
+    """Stop the exporter, writing the textfile one last time."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.stop()
+        _exporter = None
@@ -131,3 +131,24 @@ def get_frames(state, action_mode):
 
     # 4️⃣ Default: idle
     return species_frames["resting"]
+
+def get_behavior_frames(state):
+    """Return the frame list for the pet's current behavior and direction."""
+    species = state.get("species", "cat")
+    frames = PET_FRAMES.get(species, PET_FRAMES["cat"])
+    behavior = state.get("behavior", "resting")
+
+    if behavior == "sleeping":
+        return frames["sleep"]
+    elif behavior == "playing":
+        return frames["play"]
+    elif behavior == "eating":
+        return frames["eat"]
+    elif behavior == "wandering":
+        return frames["walk_right"] if state.get("direction", "right") == "right" else frames["walk_left"]
+    return frames["resting"]
+
+def get_current_frame(state):
+    """Return the sprite string currently shown for the pet."""
+    frame_list = get_behavior_frames(state)
+    return frame_list[state.get("frame_index", 0) % len(frame_list)]
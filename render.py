@@ -1,6 +1,8 @@
 import curses
-from pet_frames import PET_FRAMES
+from pet_frames import PET_FRAMES, get_current_frame
 from state import set_mode
+from timers import timer_active
+from toys import iter_toys
 from utils import STATE_FILE, safe_addstr, DEFAULT_PEN_HEIGHT, DEFAULT_PEN_WIDTH
 
 # ---------------------------
@@ -34,11 +36,11 @@ def draw_pet(stdscr, state, top, height, width, frame):
     safe_addstr(stdscr, pet_y, pet_x + 1, frame)
 
 
-def draw_ball(stdscr, state, top):
-    if state["ball_state"] != "gone" and state["ball_x"] is not None:
-        y = int(top + 1 + min(max(0, state["ball_y"]), DEFAULT_PEN_HEIGHT - 2))
-        x = int(max(1, min(DEFAULT_PEN_WIDTH - 2, state["ball_x"])) + 1)
-        safe_addstr(stdscr, y, x, "🎾")
+def draw_toys(stdscr, state, top):
+    for sprite, toy_x, toy_y in iter_toys(state):
+        y = int(top + 1 + min(max(0, toy_y), DEFAULT_PEN_HEIGHT - 2))
+        x = int(max(1, min(DEFAULT_PEN_WIDTH - 2, toy_x)) + 1)
+        safe_addstr(stdscr, y, x, sprite)
 
 
 def draw_stats(stdscr, state, top, height):
@@ -90,11 +92,20 @@ def draw_instructions(stdscr, pen_top, pen_height):
         "  [t]  pet\n"
         "  [n]  name\n"
         "  [s]  switch species\n"
+        "  [y]  toss yarn\n"
+        "  [o]  toss treat\n"
+        "  [1/2/3] speed 1x/10x/100x\n"
+        "  [space] pause\n"
         "  [q]  quit\n"
     )
 
+def draw_sim_rate(stdscr, pen_top, pen_height, sim_rate):
+    speed, ticks_per_second = sim_rate
+    label = f"{speed}x" if speed else "paused"
+    safe_addstr(stdscr, pen_top + pen_height + 5, 2, f"Speed: {label:<7} {ticks_per_second:6.1f} ticks/s")
+
 def draw_click_target(stdscr, state, pen_top, render=False):
-    if state.get("render_click_timer", 0) > 0:
+    if timer_active(state, "click_marker"):
         if state.get("target_x") is None or state.get("target_y") is None:
             return
         safe_addstr(stdscr, int(state["target_y"] + pen_top), int(state["target_x"]), "x")
@@ -130,46 +141,57 @@ def update_animation(state):
 
     state["frame_index"] %= len(frame_list)
 
+def draw_pet_picker(stdscr, pets, selected, error=None):
+    """Draw the kennel list with the selected pet highlighted."""
+    stdscr.clear()
+    safe_addstr(stdscr, 0, 2, "Kennel  [enter] open  [n] new pet  [q] quit")
+    if error:
+        stdscr.attron(curses.color_pair(1))
+        safe_addstr(stdscr, 1, 2, error)
+        stdscr.attroff(curses.color_pair(1))
+    height, _ = stdscr.getmaxyx()
+    rows = max(1, height - 3)
+    first = max(0, min(selected - rows // 2, len(pets) - rows))
+
+    for row, pet in enumerate(pets[first:first + rows]):
+        index = first + row
+        last_seen = (pet.get("last_seen") or "")[:16].replace("T", " ")
+        line = f'{pet.get("name", "?"):<20} {pet.get("species", "?"):<6} {last_seen}'
+        attr = curses.A_REVERSE if index == selected else curses.A_NORMAL
+        stdscr.attron(attr)
+        safe_addstr(stdscr, row + 2, 2, line)
+        stdscr.attroff(attr)
+
+    if not pets:
+        safe_addstr(stdscr, 2, 2, "No pets yet. Press [n] to adopt one.")
+    stdscr.refresh()
+
 # ---------------------------
 # Master draw pipeline
 # ---------------------------
 
-def draw_frame(stdscr, state):
+def draw_frame(stdscr, state, sim_rate=None):
     """Render all visual elements for the current frame."""
     pen_top = 1
     pen_height = DEFAULT_PEN_HEIGHT
     pen_width = DEFAULT_PEN_WIDTH
 
-    species = state.get("species", "cat")
-    frames = PET_FRAMES.get(species, PET_FRAMES["cat"])
-    behavior = state.get("behavior", "resting")
-
-    if behavior == "sleeping":
-        frame_list = frames["sleep"]
-    elif behavior == "playing":
-        frame_list = frames["play"]
-    elif behavior == "eating":
-        frame_list = frames["eat"]
-    elif behavior == "wandering":
-        frame_list = frames["walk_right"] if state["direction"] == "right" else frames["walk_left"]
-    else:
-        frame_list = frames["resting"]
-
-    local_index = state.get("frame_index", 0)
-    frame = frame_list[local_index % len(frame_list)]
+    frame = get_current_frame(state)
 
     draw_name(stdscr, state)
     draw_pen(stdscr, pen_top, pen_height, pen_width)
     draw_pet(stdscr, state, pen_top, pen_height, pen_width, frame)
     draw_speech_bubble(stdscr, state, pen_width)
-    draw_ball(stdscr, state, pen_top)
+    draw_toys(stdscr, state, pen_top)
     draw_stats(stdscr, state, pen_top, pen_height)
     draw_instructions(stdscr, pen_top, pen_height)
+    if sim_rate is not None:
+        draw_sim_rate(stdscr, pen_top, pen_height, sim_rate)
     draw_click_target(stdscr, state, pen_top)
 
     if state.get("debug_mode", False):
-        safe_addstr(stdscr, 25, 2, f"statefile:   {str(STATE_FILE)}")
-        safe_addstr(stdscr, 26, 2, f"behavior:    {state.get('behavior', '')}")
-        safe_addstr(stdscr, 27, 2, f"frame_index: {state.get('frame_index', 0)}")
+        safe_addstr(stdscr, 31, 2, f"statefile:   {str(STATE_FILE)}")
+        safe_addstr(stdscr, 32, 2, f"behavior:    {state.get('behavior', '')}")
+        safe_addstr(stdscr, 33, 2, f"frame_index: {state.get('frame_index', 0)}")
 
     stdscr.refresh()
@@ -1,14 +1,16 @@
 import json, random
 from datetime import datetime
+from timers import restore_timers, set_timer, timer_active
+from toys import new_toybox
 from utils import DEFAULT_PEN_WIDTH, STATE_FILE
 
-def load_state():
+def load_state(path=STATE_FILE):
     """Load pet state or initialize defaults."""
     state = None
 
-    if STATE_FILE.exists():
+    if path is not None and path.exists():
         try:
-            data = STATE_FILE.read_text().strip()
+            data = path.read_text().strip()
             if data:
                 state = json.loads(data)
         except Exception:
@@ -16,7 +18,10 @@ def load_state():
 
     if not isinstance(state, dict):
         state = {}
+    return init_state(state)
 
+def init_state(state):
+    """Fill in defaults and set up timers on a state dict read from a save."""
     defaults = {
         "name": "Mochi",
         "species": "cat",
@@ -24,29 +29,35 @@ def load_state():
         "happiness": 7,
         "energy": 8,
         "behavior": "resting",
-        "behavior_timer": 0,
         "action_timer": 0,
         "direction": "right",
         "pos_x": random.randint(5, DEFAULT_PEN_WIDTH - 10),
         "pos_y": random.randint(2, 8),
-        "ball_x": None,
-        "ball_y": None,
-        "ball_dir": None,
         "ball_state": "gone",
+        "toys": new_toybox(),
         "target_x": None,
         "target_y": None,
-        "pause_timer": 0,
-        "play_delay_timer": 0,
-        "message_timer": 0,
         "action_frame": 0,
-        "render_click_timer": 0,
         "last_seen": datetime.now().isoformat(),
-        "debug_mode": False
+        "debug_mode": False,
+        "tick": 0,
+        "timers": {},
     }
     for k, v in defaults.items():
         state.setdefault(k, v)
+
+    restore_timers(state)
+    if not timer_active(state, "behavior"):
+        set_timer(state, "behavior", 1)
     return state
 
+def start_session(state):
+    """Reset what does not carry over between runs: animation and any game of fetch."""
+    state["frame_index"] = 0
+    state["ball_state"] = "gone"
+    if state.get("behavior") == "playing":
+        state["behavior"] = "resting"
+
 def update_emotions(state):
     """Update hunger, happiness, and energy based on time away."""
     try:
@@ -54,7 +65,7 @@ def update_emotions(state):
         hours = (datetime.now() - last).total_seconds() / 3600
 
         # Hunger decreases gradually (gets hungrier)
-        state["hunger"] = max(0, state["hunger"] + (hours * 0.5))
+        state["hunger"] = min(10, max(0, state["hunger"] + (hours * 0.5)))
 
         # Happiness decays slowly
         state["happiness"] = max(0, state["happiness"] - (hours * 0.5))
@@ -74,6 +85,7 @@ def set_mode(state, behavior):
     if behavior == "sleeping":
         state["behavior"] = "sleeping"
         state["frame_index"] = 0
+        state["ball_state"] = "gone"
         return
 
     # Otherwise, restrict transitions from certain active states
@@ -82,5 +94,7 @@ def set_mode(state, behavior):
 
     state["behavior"] = behavior
     state["frame_index"] = 0
+    if behavior != "playing":
+        state["ball_state"] = "gone"
 
     
\ No newline at end of file
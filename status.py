@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Shared-memory status segment for tmux status lines and shell prompts.
+
+The running game publishes a small fixed-layout record into a memory-mapped
+file every tick. Readers map the same file and copy the record out under a
+seqlock: the writer bumps the sequence counter to an odd value before writing
+and back to an even value afterwards, so a reader retries whenever it sees an
+odd counter or the counter changed while it was copying. The header also
+records the writer's pid; the game clears the magic when it quits, and
+readers treat a segment whose writer is gone as empty.
+
+The seqlock only works with a single writer, so a game holds an exclusive
+flock on the file for as long as it publishes. A second game started in
+the same directory finds the lock taken and simply does not publish.
+
+This module must not import curses (or utils, which does) so that prompts can
+run ``python status.py`` hundreds of times a second cheaply.
+"""
+import fcntl, mmap, os, struct, sys, time
+from pathlib import Path
+from pet_frames import get_current_frame
+
+STATUS_FILE = Path.cwd() / "petbot_status.shm"
+STATUS_MAGIC = b"PETS"
+STATUS_VERSION = 2
+
+# magic, version, sequence counter, writer pid
+HEADER = struct.Struct("<4sIQI")
+# name, species, behavior, hunger, happiness, energy, frame (utf-8, NUL padded)
+PAYLOAD = struct.Struct("<32s16s16sfff64s")
+STATUS_SIZE = HEADER.size + PAYLOAD.size
+SEQ_OFFSET = 8
+
+def _pack_text(text, size):
+    """Encode text as utf-8, truncated to size bytes without splitting a character."""
+    data = str(text).encode("utf-8")[:size]
+    return data.decode("utf-8", "ignore").encode("utf-8")
+
+def _unpack_text(data):
+    return data.rstrip(b"\0").decode("utf-8", "ignore")
+
+def open_status(path=STATUS_FILE):
+    """Take the status file for this game and map it for writing.
+
+    Returns None if another running game already owns it; publish_status
+    and close_status accept that and do nothing.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    try:
+        os.ftruncate(fd, STATUS_SIZE)
+        mm = mmap.mmap(fd, STATUS_SIZE)
+    except OSError:
+        os.close(fd)  # also drops the lock
+        raise
+    HEADER.pack_into(mm, 0, STATUS_MAGIC, STATUS_VERSION, 0, os.getpid())
+    return fd, mm
+
+def publish_status(status, state):
+    """Write the pet's current status into the mapped segment."""
+    if status is None:
+        return
+    _, mm = status
+    seq = struct.unpack_from("<Q", mm, SEQ_OFFSET)[0]
+    if seq % 2:
+        seq += 1  # a previous writer died mid-update
+    struct.pack_into("<Q", mm, SEQ_OFFSET, seq + 1)
+    PAYLOAD.pack_into(
+        mm, HEADER.size,
+        _pack_text(state.get("name", ""), 32),
+        _pack_text(state.get("species", ""), 16),
+        _pack_text(state.get("behavior", ""), 16),
+        float(state.get("hunger", 0)),
+        float(state.get("happiness", 0)),
+        float(state.get("energy", 0)),
+        _pack_text(get_current_frame(state), 64),
+    )
+    struct.pack_into("<Q", mm, SEQ_OFFSET, seq + 2)
+
+def close_status(status):
+    """Mark the segment as no longer live so readers stop reporting the pet."""
+    if status is None:
+        return
+    fd, mm = status
+    HEADER.pack_into(mm, 0, b"\0" * 4, STATUS_VERSION, 0, 0)
+    mm.close()
+    os.close(fd)  # releases the lock
+
+def _writer_alive(pid):
+    """Return whether the game that wrote the segment is still running."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by someone else
+    return True
+
+def read_status(path=STATUS_FILE, retries=100):
+    """Return a consistent snapshot of the published status, or None."""
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), STATUS_SIZE, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, version, _, pid = HEADER.unpack_from(mm, 0)
+        if magic != STATUS_MAGIC or version != STATUS_VERSION:
+            return None
+        # A crashed game never gets to clear the magic
+        if not _writer_alive(pid):
+            return None
+
+        for _ in range(retries):
+            before = struct.unpack_from("<Q", mm, SEQ_OFFSET)[0]
+            if before % 2:
+                time.sleep(0)
+                continue
+            fields = PAYLOAD.unpack_from(mm, HEADER.size)
+            after = struct.unpack_from("<Q", mm, SEQ_OFFSET)[0]
+            if before == after:
+                break
+        else:
+            return None
+    finally:
+        mm.close()
+
+    name, species, behavior, hunger, happiness, energy, frame = fields
+    return {
+        "name": _unpack_text(name),
+        "species": _unpack_text(species),
+        "behavior": _unpack_text(behavior),
+        "hunger": hunger,
+        "happiness": happiness,
+        "energy": energy,
+        "frame": _unpack_text(frame),
+    }
+
+def format_status(status):
+    """Render a one-line status string for prompts and status bars."""
+    return (
+        f'{status["frame"]} {status["name"]} ({status["behavior"]}) '
+        f'H:{status["hunger"]:.0f} J:{status["happiness"]:.0f} E:{status["energy"]:.0f}'
+    )
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = Path(argv[0]) if argv else STATUS_FILE
+    status = read_status(path)
+    if status is None:
+        return 1
+    print(format_status(status))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
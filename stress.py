@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Invariant stress harness for the pet state machine.
+
+Runs many seeded simulations in parallel worker processes, injecting random
+key presses, mouse clicks and save/reload restarts through the same code the
+game uses, and checks the invariants below after every tick. The first
+failing seed is shrunk to a minimal list of inputs and printed as a reproducer.
+
+    python stress.py --seeds 2000 --ticks 5000
+    python stress.py --replay '{"seed": 7, "ticks": 40, "inputs": [[3, "p"]]}'
+    python stress.py --check-timers
+"""
+import argparse, json, multiprocessing, random, sys, time
+import behavior, game_actions
+from game_actions import handle_input, handle_mouse_click
+from main import tick
+from state import init_state, load_state, start_session
+from timers import LEVELS, SLOTS, TIMER_CALLBACKS, advance_timers, on_timer, restore_timers, set_timer, timer_active
+from toys import MAX_TOYS, TOY_FIELDS, get_toybox, toy_bounds, toys_moving
+from utils import DEFAULT_PEN_HEIGHT, DEFAULT_PEN_WIDTH, state_to_json
+
+BEHAVIORS = ("resting", "wandering", "sleeping", "eating", "playing", "petting")
+BALL_STATES = ("gone", "resting", "flying")
+STATS = ("hunger", "happiness", "energy")
+
+# Keys that do not need a real terminal ([n] prompts, [q] quits)
+INPUT_KEYS = "fptsdyo"
+INPUT_RATE = 0.05
+# Occasionally toss toys in bulk so full toy boxes get exercised too
+BURST_RATE = 0.02
+# ...or quit and restart the game, round-tripping the state through a save
+RELOAD_RATE = 0.05
+MAX_STEP = 1
+# Delay, walk across the pen and wait for the toy to settle, with room to spare
+MAX_PLAY_TICKS = 120
+
+class InvariantError(AssertionError):
+    pass
+
+def _no_save(state):
+    pass
+
+def _setup_worker():
+    # Actions save after every change; keep the harness off the disk.
+    behavior.save_state = _no_save
+    game_actions.save_state = _no_save
+
+def random_inputs(seed, ticks):
+    """Generate a reproducible list of (tick, event) pairs for a seed."""
+    rng = random.Random(seed ^ 0x5EED)
+    inputs = []
+    for t in range(ticks):
+        if rng.random() >= INPUT_RATE:
+            continue
+        roll = rng.random()
+        if roll < BURST_RATE:
+            inputs.append([t, "burst", rng.randint(MAX_TOYS // 4, MAX_TOYS + 16)])
+        elif roll < BURST_RATE + RELOAD_RATE:
+            inputs.append([t, "reload"])
+        elif roll < 0.2:
+            inputs.append([t, "click", rng.randint(0, DEFAULT_PEN_WIDTH + 2), rng.randint(0, DEFAULT_PEN_HEIGHT + 2)])
+        else:
+            inputs.append([t, rng.choice(INPUT_KEYS)])
+    return inputs
+
+def check_invariants(state, prev_x, prev_y):
+    if state["behavior"] not in BEHAVIORS:
+        raise InvariantError(f"unknown behavior {state['behavior']!r}")
+    if state["ball_state"] not in BALL_STATES:
+        raise InvariantError(f"unknown ball_state {state['ball_state']!r}")
+    if state["ball_state"] != "gone" and state["behavior"] != "playing":
+        raise InvariantError(f"ball_state {state['ball_state']!r} while {state['behavior']}")
+    if state["behavior"] == "playing" and state["ball_state"] == "gone":
+        raise InvariantError("playing with no toy in play")
+
+    if not 1 <= state["pos_x"] <= DEFAULT_PEN_WIDTH - 8:
+        raise InvariantError(f"pos_x {state['pos_x']} outside pen")
+    if not 1 <= state["pos_y"] <= DEFAULT_PEN_HEIGHT - 2:
+        raise InvariantError(f"pos_y {state['pos_y']} outside pen")
+    if abs(state["pos_x"] - prev_x) > MAX_STEP or abs(state["pos_y"] - prev_y) > MAX_STEP:
+        raise InvariantError(f"pet jumped from ({prev_x}, {prev_y}) to ({state['pos_x']}, {state['pos_y']})")
+
+    for stat in STATS:
+        if not 0 <= state[stat] <= 10:
+            raise InvariantError(f"{stat} {state[stat]} outside 0..10")
+    for name, deadline in state["timers"].items():
+        if deadline <= state["tick"]:
+            raise InvariantError(f"timer {name!r} overdue ({deadline} <= {state['tick']})")
+    if not timer_active(state, "behavior"):
+        raise InvariantError("no behavior timer scheduled")
+    if state.get("speech") and not timer_active(state, "speech"):
+        raise InvariantError(f"speech {state['speech']!r} never clears")
+
+    box = get_toybox(state)
+    if set(box) != set(TOY_FIELDS):
+        raise InvariantError(f"toy box holds {sorted(set(box) - set(TOY_FIELDS))}")
+    if len(box["kind"]) > MAX_TOYS:
+        raise InvariantError(f"{len(box['kind'])} toys in the pen")
+    moving = sum(1 for vx, vy in zip(box["vx"], box["vy"]) if vx or vy)
+    if toys_moving(state) != moving:
+        raise InvariantError(f"{toys_moving(state)} toys counted as moving, {moving} are")
+    left, right, top, bottom = toy_bounds(DEFAULT_PEN_WIDTH, DEFAULT_PEN_HEIGHT)
+    for x, y in zip(box["x"], box["y"]):
+        if not (left <= x <= right and top <= y <= bottom):
+            raise InvariantError(f"toy at ({x:.2f}, {y:.2f}) outside the pet's reach")
+
+def check_liveness(state, play_ticks):
+    """Return how long the current play session has lasted; fail if it never ends."""
+    if state["ball_state"] == "gone":
+        return 0
+    if play_ticks >= MAX_PLAY_TICKS:
+        raise InvariantError(f"play still going after {MAX_PLAY_TICKS} ticks")
+    return play_ticks + 1
+
+def reload(state):
+    """Save and reload the state the way quitting and restarting the game does."""
+    state = init_state(json.loads(state_to_json(state)))
+    start_session(state)
+    return state
+
+def apply_input(state, event):
+    """Apply one input event; returns the state, which a reload replaces."""
+    if event[0] == "reload":
+        return reload(state)
+    if event[0] == "click":
+        handle_mouse_click(event[1], event[2], state)
+    elif event[0] == "burst":
+        for i in range(event[1]):
+            game_actions.toss_toy(state, "yarn" if i % 2 else "treat", DEFAULT_PEN_WIDTH, DEFAULT_PEN_HEIGHT)
+    else:
+        handle_input(None, ord(event[0]), state)
+    return state
+
+def simulate(seed, ticks, inputs):
+    """Run one simulation; return None or (failing tick, message)."""
+    random.seed(seed)
+    state = load_state(None)
+    start_session(state)
+
+    pending = iter(inputs)
+    next_input = next(pending, None)
+    play_ticks = 0
+    for t in range(ticks):
+        prev_x, prev_y = state["pos_x"], state["pos_y"]
+        try:
+            tick(state)
+            while next_input is not None and next_input[0] == t:
+                state = apply_input(state, next_input[1:])
+                next_input = next(pending, None)
+            check_invariants(state, prev_x, prev_y)
+            play_ticks = check_liveness(state, play_ticks)
+        except InvariantError as e:
+            return t, str(e)
+        except Exception as e:
+            return t, f"{type(e).__name__}: {e}"
+    return None
+
+def shrink(seed, ticks, inputs):
+    """Reduce a failing run to a short tick count and a minimal set of inputs."""
+    failure = simulate(seed, ticks, inputs)
+    ticks = failure[0] + 1
+    inputs = [i for i in inputs if i[0] < ticks]
+
+    chunk = max(1, len(inputs) // 2)
+    while inputs:
+        removed = False
+        for start in range(0, len(inputs), chunk):
+            candidate = inputs[:start] + inputs[start + chunk:]
+            result = simulate(seed, ticks, candidate)
+            if result is not None:
+                inputs, ticks, failure = candidate, result[0] + 1, result
+                removed = True
+                break
+        if not removed:
+            if chunk == 1:
+                break
+            chunk = max(1, chunk // 2)
+    return {"seed": seed, "ticks": ticks, "inputs": inputs, "error": failure[1]}
+
+def run_seed(args):
+    seed, ticks = args
+    inputs = random_inputs(seed, ticks)
+    failure = simulate(seed, ticks, inputs)
+    if failure is None:
+        return seed, ticks, None
+    return seed, failure[0] + 1, shrink(seed, ticks, inputs)
+
+# Start ticks and countdowns around every slot and level boundary of the timer wheel
+TIMER_STARTS = (0, 1, SLOTS - 1, SLOTS, SLOTS ** 2 - 1, SLOTS ** 2, SLOTS ** 3 - 1, 123457)
+TIMER_DELAYS = (1, 2, SLOTS - 1, SLOTS, SLOTS + 1, SLOTS ** 2 - 1, SLOTS ** 2, SLOTS ** 2 + 1,
+                SLOTS ** 3 - 1, SLOTS ** 3, SLOTS ** 3 + 1)
+
+def _run_timers(start, delays, reload_at=None, restart=None):
+    """Schedule one timer per delay and return {name: [ticks it fired on]}."""
+    fired = {}
+    state = {"tick": start}
+    restore_timers(state)
+    for delay in delays:
+        name = f"check:{delay}"
+        on_timer(name)(lambda st, name=name: fired.setdefault(name, []).append(st["tick"]))
+        set_timer(state, name, delay)
+    if restart is not None:
+        set_timer(state, f"check:{restart}", restart * 2)  # the first deadline must not fire
+
+    end = start + max(delays) * (2 if restart is not None else 1)
+    while state["tick"] < end:
+        if state["tick"] == reload_at:
+            state = json.loads(state_to_json(state))
+            restore_timers(state)
+        advance_timers(state)
+    for name in fired:
+        TIMER_CALLBACKS.pop(name, None)
+    return fired
+
+def check_timers():
+    """Check that every timer fires exactly once, on its deadline. Returns the failures."""
+    failures = []
+
+    def expect(label, fired, deadlines):
+        for name, deadline in deadlines.items():
+            if fired.get(name) != [deadline]:
+                failures.append(f"{label}: {name} due at {deadline}, fired at {fired.get(name, [])}")
+
+    for start in TIMER_STARTS:
+        deadlines = {f"check:{d}": start + d for d in TIMER_DELAYS}
+        expect(f"start {start}", _run_timers(start, TIMER_DELAYS), deadlines)
+
+        reload_at = start + SLOTS ** 2 + 3
+        expect(f"start {start}, reloaded at {reload_at}",
+               _run_timers(start, TIMER_DELAYS, reload_at=reload_at), deadlines)
+
+        restarted = dict(deadlines, **{f"check:{SLOTS}": start + 2 * SLOTS})
+        expect(f"start {start}, restarted", _run_timers(start, TIMER_DELAYS, restart=SLOTS), restarted)
+
+    # Past the top level: the entry wraps and must be re-placed, not fired early
+    far = SLOTS ** LEVELS + 5
+    expect("beyond top level", _run_timers(17, (far,)), {f"check:{far}": 17 + far})
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=1000, help="number of simulations")
+    parser.add_argument("--start", type=int, default=0, help="first seed")
+    parser.add_argument("--ticks", type=int, default=5000, help="ticks per simulation")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--replay", help="JSON reproducer to run once")
+    parser.add_argument("--check-timers", action="store_true", help="check timer wheel fire times and exit")
+    args = parser.parse_args(argv)
+
+    if args.check_timers:
+        started = time.perf_counter()
+        failures = check_timers()
+        for failure in failures:
+            print(failure)
+        print(f"timer wheel: {len(failures)} failures in {time.perf_counter() - started:.1f}s")
+        return 1 if failures else 0
+
+    _setup_worker()
+    if args.replay:
+        case = json.loads(args.replay)
+        result = simulate(case["seed"], case["ticks"], case["inputs"])
+        print("ok" if result is None else f"tick {result[0]}: {result[1]}")
+        return 0 if result is None else 1
+
+    jobs = [(seed, args.ticks) for seed in range(args.start, args.start + args.seeds)]
+    failures = []
+    total = 0
+    started = time.perf_counter()
+    with multiprocessing.Pool(args.workers, initializer=_setup_worker) as pool:
+        for seed, ticks, failure in pool.imap_unordered(run_seed, jobs, chunksize=4):
+            total += ticks
+            if failure is not None:
+                failures.append(failure)
+    elapsed = time.perf_counter() - started
+
+    print(f"{total:,} ticks in {elapsed:.1f}s ({total / elapsed * 60:,.0f} ticks/min)")
+    for failure in sorted(failures, key=lambda f: (len(f["inputs"]), f["ticks"])):
+        print(json.dumps(failure))
+    if failures:
+        print(f"{len(failures)} of {len(jobs)} seeds failed")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
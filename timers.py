@@ -0,0 +1,116 @@
+"""Hierarchical timer wheel for per-pet countdowns.
+
+Timers are named and stored as absolute tick deadlines in
+``state["timers"]`` next to the pet's tick counter ``state["tick"]``, so
+they survive save/load unchanged. The wheel itself is rebuilt from those
+deadlines when needed and kept under ``state["_timer_wheel"]``, which is
+never saved.
+
+Each level has 64 slots; a slot on level L covers 64**L ticks. A tick
+only looks at one level-0 slot, plus one higher slot each time a lower
+level wraps around. So the work per tick grows with the number of timers
+that fire, not with the number of timers that exist. When a timer fires,
+the callback registered for its name with ``on_timer`` runs.
+"""
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 4
+
+# Countdown fields from older saves, and the timers that replaced them
+LEGACY_TIMERS = {
+    "behavior_timer": "behavior",
+    "message_timer": "speech",
+    "play_delay_timer": "play_delay",
+    "render_click_timer": "click_marker",
+    "pause_timer": None,
+}
+
+TIMER_CALLBACKS = {}
+
+def on_timer(name):
+    """Register the function called (with the state) when timer `name` fires."""
+    def register(callback):
+        TIMER_CALLBACKS[name] = callback
+        return callback
+    return register
+
+def _new_wheel():
+    return [[[] for _ in range(SLOTS)] for _ in range(LEVELS)]
+
+def _place(wheel, next_tick, name, deadline):
+    """Put an entry in the lowest level whose range reaches its deadline.
+
+    `next_tick` is the earliest tick whose slot has not been processed yet;
+    overdue entries fire then.
+    """
+    due = max(deadline, next_tick)
+    for level in range(LEVELS):
+        shift = level * SLOT_BITS
+        if (due >> shift) - (next_tick >> shift) < SLOTS:
+            break
+    # Anything beyond the top level wraps; it is re-placed when its slot cascades
+    wheel[level][(due >> shift) & SLOT_MASK].append((name, deadline))
+
+def _get_wheel(state):
+    wheel = state.get("_timer_wheel")
+    if wheel is None:
+        wheel = _new_wheel()
+        next_tick = state.get("tick", 0) + 1
+        for name, deadline in state.get("timers", {}).items():
+            _place(wheel, next_tick, name, deadline)
+        state["_timer_wheel"] = wheel
+    return wheel
+
+def restore_timers(state):
+    """Set up timers on a freshly loaded state, converting old countdown fields."""
+    state.setdefault("tick", 0)
+    timers = state.setdefault("timers", {})
+    for field, name in LEGACY_TIMERS.items():
+        remaining = state.pop(field, 0)
+        if name and name not in timers and isinstance(remaining, (int, float)) and remaining > 0:
+            timers[name] = state["tick"] + int(remaining)
+    state.pop("_timer_wheel", None)
+    _get_wheel(state)
+
+def set_timer(state, name, ticks):
+    """(Re)start timer `name` to fire `ticks` ticks from now."""
+    now = state.get("tick", 0)
+    deadline = now + max(1, int(ticks))
+    state.setdefault("timers", {})[name] = deadline
+    _place(_get_wheel(state), now + 1, name, deadline)
+
+def timer_active(state, name):
+    return name in state.get("timers", {})
+
+def advance_timers(state):
+    """Move to the next tick and run the callbacks of every timer that expires on it."""
+    wheel = _get_wheel(state)
+    timers = state.setdefault("timers", {})
+    now = state.get("tick", 0) + 1
+    state["tick"] = now
+
+    # Cascade from the highest level that wrapped down to level 1
+    top = 0
+    while top + 1 < LEVELS and (now >> (top * SLOT_BITS)) & SLOT_MASK == 0:
+        top += 1
+    for level in range(top, 0, -1):
+        slot = (now >> (level * SLOT_BITS)) & SLOT_MASK
+        entries, wheel[level][slot] = wheel[level][slot], []
+        for name, deadline in entries:
+            if timers.get(name) == deadline:
+                _place(wheel, now, name, deadline)
+
+    slot = now & SLOT_MASK
+    entries, wheel[0][slot] = wheel[0][slot], []
+    for name, deadline in entries:
+        if timers.get(name) != deadline:
+            continue  # restarted with a new deadline, or already fired
+        if deadline > now:
+            _place(wheel, now + 1, name, deadline)  # wrapped past the top level
+            continue
+        del timers[name]
+        callback = TIMER_CALLBACKS.get(name)
+        if callback is not None:
+            callback(state)
@@ -0,0 +1,199 @@
+"""Toys in the pen: balls, yarn and treats with simple wall-bounce physics.
+
+Toys live in ``state["toys"]`` as parallel lists (one list per attribute)
+so the whole box stays JSON-serialisable and every tick is a single pass
+over flat arrays. Alongside them we keep a coarse grid of toy indices,
+rebuilt during that pass, so the pet can find the nearest toy by looking
+at a few neighbouring cells instead of every toy. The grid and the count
+of moving toys are derived data: they live under ``state["_toy_index"]``,
+which is never saved, and are rebuilt after loading.
+"""
+import math
+
+# sprite, friction (velocity kept per tick), bounce (velocity kept on wall hit)
+TOY_KINDS = {
+    "ball": {"sprite": "🎾", "friction": 0.85, "bounce": 0.8},
+    "yarn": {"sprite": "🧶", "friction": 0.7, "bounce": 0.4},
+    "treat": {"sprite": "🍖", "friction": 0.5, "bounce": 0.2},
+}
+
+GRID_CELL = 5
+REST_SPEED = 0.25
+# Far more than fit visibly in the pen; only there to keep saves bounded
+MAX_TOYS = 256
+
+# The pet stops at pen_width - 8 and slaps toys within SLAP_RANGE cells,
+# so toys must never settle further right than that.
+PET_RIGHT_MARGIN = 8
+SLAP_RANGE = 4
+TOY_FIELDS = ("kind", "x", "y", "vx", "vy")
+
+def new_toybox():
+    """Return an empty toy box."""
+    return {field: [] for field in TOY_FIELDS}
+
+def get_toybox(state):
+    box = state.get("toys")
+    if not isinstance(box, dict) or any(not isinstance(box.get(f), list) for f in TOY_FIELDS):
+        box = new_toybox()
+        state["toys"] = box
+        state.pop("_toy_index", None)
+    return box
+
+def _get_index(state):
+    """Return the grid/moving index, rebuilding it if the state was just loaded."""
+    index = state.get("_toy_index")
+    if index is None:
+        box = get_toybox(state)
+        for key in ("cells", "moving"):
+            box.pop(key, None)  # written by older saves
+        index = {"cells": {}, "moving": 0}
+        for i in range(len(box["kind"])):
+            _grid_insert(index, box, i)
+            if box["vx"][i] or box["vy"][i]:
+                index["moving"] += 1
+        state["_toy_index"] = index
+    return index
+
+def toy_count(state):
+    return len(get_toybox(state)["kind"])
+
+def toys_moving(state):
+    return _get_index(state)["moving"]
+
+def toy_bounds(pen_width, pen_height):
+    """Return (left, right, top, bottom): where toys may be and the pet can still reach them."""
+    return 1, pen_width - PET_RIGHT_MARGIN + SLAP_RANGE, 0, pen_height - 2
+
+def add_toy(state, kind, x, y, vx=0.0, vy=0.0):
+    """Drop a toy into the pen and return its index, or None if the box is full."""
+    if kind not in TOY_KINDS:
+        raise ValueError(f"Unknown toy: {kind}")
+    box = get_toybox(state)
+    index = _get_index(state)
+    if len(box["kind"]) >= MAX_TOYS:
+        return None
+    box["kind"].append(kind)
+    box["x"].append(float(x))
+    box["y"].append(float(y))
+    box["vx"].append(float(vx))
+    box["vy"].append(float(vy))
+    _grid_insert(index, box, len(box["kind"]) - 1)
+    if vx or vy:
+        index["moving"] += 1
+    return len(box["kind"]) - 1
+
+def remove_toy(state, index):
+    """Remove a toy, keeping the others in the order they were added."""
+    box = get_toybox(state)
+    for field in TOY_FIELDS:
+        del box[field][index]
+    state.pop("_toy_index", None)
+
+def push_toy(state, index, vx, vy):
+    """Give a toy a kick."""
+    box = get_toybox(state)
+    toy_index = _get_index(state)
+    if not (box["vx"][index] or box["vy"][index]):
+        toy_index["moving"] += 1
+    box["vx"][index] = float(vx)
+    box["vy"][index] = float(vy)
+
+def _cell(x, y):
+    return int(x) // GRID_CELL, int(y) // GRID_CELL
+
+def _grid_insert(index, box, i):
+    index["cells"].setdefault(_cell(box["x"][i], box["y"][i]), []).append(i)
+
+def update_toys(state, pen_width, pen_height):
+    """Advance every toy one tick: move, bounce off the pen walls, slow down."""
+    box = get_toybox(state)
+    kinds, xs, ys, vxs, vys = (box[f] for f in TOY_FIELDS)
+
+    bounds = toy_bounds(pen_width, pen_height)
+    left, right, top, bottom = bounds
+
+    # Toys at rest stay put, so there is nothing to do until one is pushed
+    index = state.get("_toy_index")
+    if index is not None and index["moving"] == 0 and index.get("bounds") == bounds:
+        return
+
+    cells = {}
+    moving = 0
+    for i in range(len(kinds)):
+        vx, vy = vxs[i], vys[i]
+        x, y = xs[i], ys[i]
+
+        if vx or vy:
+            props = TOY_KINDS.get(kinds[i], TOY_KINDS["ball"])
+            x += vx
+            y += vy
+
+            if x < left:
+                x, vx = 2 * left - x, -vx * props["bounce"]
+            elif x > right:
+                x, vx = 2 * right - x, -vx * props["bounce"]
+            if y < top:
+                y, vy = 2 * top - y, -vy * props["bounce"]
+            elif y > bottom:
+                y, vy = 2 * bottom - y, -vy * props["bounce"]
+
+            vx *= props["friction"]
+            vy *= props["friction"]
+            if math.hypot(vx, vy) < REST_SPEED:
+                vx = vy = 0.0
+            else:
+                moving += 1
+
+            vxs[i], vys[i] = vx, vy
+
+        # A very fast toy can overshoot after reflecting, and older saves may
+        # hold toys outside the current bounds
+        if not (left <= x <= right and top <= y <= bottom):
+            x = max(left, min(right, x))
+            y = max(top, min(bottom, y))
+        xs[i], ys[i] = x, y
+
+        cells.setdefault(_cell(x, y), []).append(i)
+
+    state["_toy_index"] = {"cells": cells, "moving": moving, "bounds": bounds}
+
+def nearest_toy(state, x, y, pen_width, pen_height, kind=None):
+    """Return the index of the toy closest to (x, y), or None if the pen is empty.
+
+    Searches outward ring by ring through the grid and stops as soon as no
+    unvisited cell could hold anything closer than the best toy found.
+    """
+    box = get_toybox(state)
+    if not box["kind"]:
+        return None
+
+    cells = _get_index(state)["cells"]
+    cx, cy = _cell(x, y)
+    left, right, top, bottom = toy_bounds(pen_width, pen_height)
+    min_gx, min_gy = _cell(left, top)
+    max_gx, max_gy = _cell(right, bottom)
+    max_ring = max(cx - min_gx, max_gx - cx, cy - min_gy, max_gy - cy, 0)
+
+    best, best_dist = None, math.inf
+    for ring in range(max_ring + 1):
+        # Anything in this ring is at least (ring - 1) whole cells away
+        if best is not None and (ring - 1) * GRID_CELL > best_dist:
+            break
+        for gx in range(cx - ring, cx + ring + 1):
+            for gy in range(cy - ring, cy + ring + 1):
+                if max(abs(gx - cx), abs(gy - cy)) != ring:
+                    continue
+                for i in cells.get((gx, gy), ()):
+                    if kind is not None and box["kind"][i] != kind:
+                        continue
+                    dist = math.hypot(box["x"][i] - x, box["y"][i] - y)
+                    if dist < best_dist:
+                        best, best_dist = i, dist
+    return best
+
+def iter_toys(state):
+    """Yield (sprite, x, y) for every toy, for drawing."""
+    box = get_toybox(state)
+    for kind, x, y in zip(box["kind"], box["x"], box["y"]):
+        yield TOY_KINDS.get(kind, TOY_KINDS["ball"])["sprite"], x, y
@@ -2,6 +2,7 @@ import curses
 from datetime import datetime
 import json
 from pathlib import Path
+import metrics
 
 DEFAULT_PEN_WIDTH = 25
 DEFAULT_PEN_HEIGHT = 10
@@ -46,9 +47,21 @@ def init_colors():
         pass
 
 
+def state_to_json(state):
+    """Serialize a state, leaving out runtime-only keys (those starting with "_")."""
+    return json.dumps({k: v for k, v in state.items() if not k.startswith("_")}, indent=2)
+
 def save_state(state):
     state["last_seen"] = datetime.now().isoformat()
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+    metrics.inc("saves")
+    if state.get("kennel_id"):
+        # Imported here because kennel builds on state, which imports utils
+        from kennel import save_pet
+        save_pet(state)
+        return
+    data = state_to_json(state)
+    STATE_FILE.write_text(data)
+    metrics.inc("save_bytes", len(data.encode("utf-8")))
 
 def toggle_debug_mode(state):
     debug = state["debug_mode"]